@@ -0,0 +1,55 @@
+import json
+import time
+import os
+import hashlib
+import sqlite3
+import tempfile
+import threading
+from contextlib import closing
+
+# 뉴스/날씨 스크립트가 함께 사용하는 로컬 캐시 (워커의 임시 디렉토리에 sqlite로 저장)
+# 이 모듈은 import 시 부수 효과(wmill 변수 조회 등)가 없어야 합니다.
+# u/rapaellk (뉴스 스크립트)와 f/telegram_life_bot (날씨/봇 스크립트)에 각각 배포합니다.
+CACHE_DB_PATH = os.path.join(tempfile.gettempdir(), "windmill_scripts_cache.sqlite3")
+_cache_lock = threading.Lock()
+
+def make_cache_key(*parts: str) -> str:
+    """캐시 키로 사용할 SHA256 해시를 만듭니다."""
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+def _open_cache_db():
+    conn = sqlite3.connect(CACHE_DB_PATH, timeout=10)
+    conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+    return conn
+
+def cache_get(key: str):
+    """
+    캐시에서 값을 읽습니다. 없거나 만료되었거나 캐시를 사용할 수 없으면 None을 반환합니다.
+    """
+    try:
+        with _cache_lock, closing(_open_cache_db()) as conn:
+            row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        print(f"[Warning] Cache read failed: {e}")
+        return None
+    if row is None or row[1] < time.time():
+        return None
+    try:
+        return json.loads(row[0])
+    except json.JSONDecodeError as e:
+        print(f"[Warning] Broken cache entry ignored: {e}")
+        return None
+
+def cache_set(key: str, value, ttl_seconds: int):
+    """
+    값을 JSON으로 직렬화하여 ttl_seconds 동안 캐시에 저장합니다.
+    캐시 저장 실패는 본 작업을 막지 않도록 경고만 출력합니다.
+    """
+    try:
+        with _cache_lock, closing(_open_cache_db()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time() + ttl_seconds)
+            )
+    except sqlite3.Error as e:
+        print(f"[Warning] Cache write failed: {e}")
@@ -5,6 +5,10 @@ from typing import Dict, Any
 import traceback
 import telegramify_markdown
 import json
+import numpy as np
+import functools
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from geopy.geocoders import Nominatim
 
 import google.generativeai as genai
@@ -13,72 +17,98 @@ import time
 from google.api_core.exceptions import ResourceExhausted
 from typing import Dict, Any
 
+# 공통 모듈은 이 스크립트와 같은 폴더(f/telegram_life_bot)에 함께 배포합니다.
+try:
+    from f.telegram_life_bot.cache_utils import make_cache_key, cache_get, cache_set
+    from f.telegram_life_bot.http_utils import create_session, API_RETRY
+    from f.telegram_life_bot.retry_utils import get_retry_delay_seconds
+except ImportError:
+    # 로컬 테스트 등을 위한 fallback
+    from cache_utils import make_cache_key, cache_get, cache_set
+    from http_utils import create_session, API_RETRY
+    from retry_utils import get_retry_delay_seconds
+
 genai.configure(api_key=wmill.get_variable("u/rapaellk/googleai_api_key_free"))
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
+
+# (1) 시스템 프롬프트: 모델의 역할, 규칙, 페르소나 정의
+SYSTEM_PROMPT = """
+당신은 날씨 데이터를 분석하여 사용자에게 조언을 주는 유용한 AI 비서입니다.
+당신의 유일한 임무는 입력된 JSON 날씨 데이터를 기반으로, 번역 및 외출 제안이 포함된 JSON 객체 하나를 반환하는 것입니다.
+다른 설명이나 텍스트를 절대 추가하지 마세요.
+
+다음은 'suggestion' 필드를 생성할 때 반드시 따라야 할 규칙입니다 (이 외에 다른 조언이 있다면 추가해도 좋습니다):
+- [강수] '오늘 강수 확률 (%)'가 30% 이상이면 우산을 챙기라는 조언을 포함합니다.
+- [대기질] '대기질 지수 (AQI)', '미세먼지 (PM2.5)', '초미세먼지 (PM10)', '오존 (O3)' 값에 '나쁨' 또는 '매우 나쁨'이 포함되면, 외출을 자제하거나 마스크 착용을 권장합니다.
+- [자외선] '오늘 자외선 지수 (UVI)'가 6 이상이면(높음), 8 이상이면(매우 높음) 자외선 차단제, 모자, 선글라스 등을 권장합니다.
+- [일교차] '최고 기온 (°C)'과 '최저 기온 (°C)'의 차이가 10도 이상이면 겉옷을 챙겨 체온 조절에 유의하라고 조언합니다.
+- [바람] '오늘 풍속 (m/s)'이 7 m/s 이상이면 바람이 강하게 분다는 사실을 언급합니다.
+- [긍정] 날씨와 공기 질이 모두 좋다면(예: 맑음, 강수확률 낮음, AQI 좋음/보통), 야외 활동하기 좋은 날씨라고 언급합니다.
+- [종합] 이 모든 조건을 종합하여 하나의 자연스러운 문단으로 'suggestion'을 만듭니다.
+- [강조] 특히 외출시 잊지 말아야 할 것(우산, 마스크, 외투, 선크림, 외출 자제 등)에 대한 키워드는 ☂️, 😷, 🧥, ☀️, 🏠 등의 적절한 이모지를 붙여서 강조해주세요.
+"""
+
+# (2) 사용자 프롬프트 템플릿: 실제 데이터와 작업 지시
+USER_PROMPT_TEMPLATE = """
+다음 JSON 날씨 데이터를 분석해 주세요.
+
+[입력 데이터]
+{input_data}
+
+[출력 스키마]
+{{
+"location_ko": "번역된 위치 ('위치' 필드 번역)",
+"summary_ko": "번역된 요약 ('요약' 필드 번역)",
+"alert_ko": "번역된 경보 ('경보' 필드 번역, 없으면 빈 문자열)",
+"suggestion": "시스템 프롬프트의 모든 규칙에 따라 생성된 종합 외출 제안 멘트"
+}}
+"""
+
+# (3) 생성 설정: Temperature 및 JSON 모드 설정
+GENERATION_CONFIG = genai.GenerationConfig(
+    temperature=0.2,  # 일관된 논리 + 약간 자연스러운 문장
+    response_mime_type="application/json" # JSON 출력 모드 강제
+)
+
+# (4) 모델 초기화 (시스템 프롬프트, 생성 설정 적용) - 호출마다 만들지 않고 재사용합니다.
+GEMINI_MODEL = genai.GenerativeModel(
+    model_name=GEMINI_MODEL_NAME,
+    system_instruction=SYSTEM_PROMPT,
+    generation_config=GENERATION_CONFIG
+)
+
+# 캐시 유효 시간 (캐시 자체는 cache_utils 참고)
+GEMINI_CACHE_TTL_SECONDS = 60 * 60  # 1시간
+GEO_REVERSE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60  # 30일 (좌표의 지명은 사실상 바뀌지 않음)
+WEATHER_CACHE_TTL_SECONDS = 10 * 60  # 10분
+POLLUTION_CACHE_TTL_SECONDS = 15 * 60  # 15분
 
 def process_weather_info_with_gemini(data: Dict[str, Any], max_retries=3, delay_seconds=60):
-    # (1) 시스템 프롬프트: 모델의 역할, 규칙, 페르소나 정의
-    SYSTEM_PROMPT = """
-    당신은 날씨 데이터를 분석하여 사용자에게 조언을 주는 유용한 AI 비서입니다.
-    당신의 유일한 임무는 입력된 JSON 날씨 데이터를 기반으로, 번역 및 외출 제안이 포함된 JSON 객체 하나를 반환하는 것입니다.
-    다른 설명이나 텍스트를 절대 추가하지 마세요.
-
-    다음은 'suggestion' 필드를 생성할 때 반드시 따라야 할 규칙입니다 (이 외에 다른 조언이 있다면 추가해도 좋습니다):
-    - [강수] '오늘 강수 확률 (%)'가 30% 이상이면 우산을 챙기라는 조언을 포함합니다.
-    - [대기질] '대기질 지수 (AQI)', '미세먼지 (PM2.5)', '초미세먼지 (PM10)', '오존 (O3)' 값에 '나쁨' 또는 '매우 나쁨'이 포함되면, 외출을 자제하거나 마스크 착용을 권장합니다.
-    - [자외선] '오늘 자외선 지수 (UVI)'가 6 이상이면(높음), 8 이상이면(매우 높음) 자외선 차단제, 모자, 선글라스 등을 권장합니다.
-    - [일교차] '최고 기온 (°C)'과 '최저 기온 (°C)'의 차이가 10도 이상이면 겉옷을 챙겨 체온 조절에 유의하라고 조언합니다.
-    - [바람] '오늘 풍속 (m/s)'이 7 m/s 이상이면 바람이 강하게 분다는 사실을 언급합니다.
-    - [긍정] 날씨와 공기 질이 모두 좋다면(예: 맑음, 강수확률 낮음, AQI 좋음/보통), 야외 활동하기 좋은 날씨라고 언급합니다.
-    - [종합] 이 모든 조건을 종합하여 하나의 자연스러운 문단으로 'suggestion'을 만듭니다.
-    - [강조] 특히 외출시 잊지 말아야 할 것(우산, 마스크, 외투, 선크림, 외출 자제 등)에 대한 키워드는 ☂️, 😷, 🧥, ☀️, 🏠 등의 적절한 이모지를 붙여서 강조해주세요.
-    """
-
-    # (2) 사용자 프롬프트 템플릿: 실제 데이터와 작업 지시
-    USER_PROMPT_TEMPLATE = """
-    다음 JSON 날씨 데이터를 분석해 주세요.
-
-    [입력 데이터]
-    {input_data}
-
-    [출력 스키마]
-    {{
-    "location_ko": "번역된 위치 ('위치' 필드 번역)",
-    "summary_ko": "번역된 요약 ('요약' 필드 번역)",
-    "alert_ko": "번역된 경보 ('경보' 필드 번역, 없으면 빈 문자열)",
-    "suggestion": "시스템 프롬프트의 모든 규칙에 따라 생성된 종합 외출 제안 멘트"
-    }}
-    """
-
-    # (3) 생성 설정: Temperature 및 JSON 모드 설정
-    GENERATION_CONFIG = genai.GenerationConfig(
-        temperature=0.2,  # 일관된 논리 + 약간 자연스러운 문장
-        response_mime_type="application/json" # JSON 출력 모드 강제
-    )
-
-    print("Gemini API에 날씨 분석 요청 중...")
-        # 1. 모델 초기화 (시스템 프롬프트, 생성 설정 적용)
-    model = genai.GenerativeModel(
-        model_name='gemini-2.5-flash',
-        system_instruction=SYSTEM_PROMPT,
-        generation_config=GENERATION_CONFIG
-    )
-    
-    # 2. 사용자 프롬프트 완성
+    # 사용자 프롬프트 완성
     # (json.dumps로 데이터를 문자열로 변환)
     user_prompt = USER_PROMPT_TEMPLATE.format(
         input_data=json.dumps(data, indent=2, ensure_ascii=False)
     )
-        
+
+    # 같은 날씨 데이터에 대해서는 1시간 동안 이전 분석 결과를 재사용합니다.
+    cache_key = make_cache_key("gemini", GEMINI_MODEL_NAME, SYSTEM_PROMPT, user_prompt)
+    cached = cache_get(cache_key)
+    if cached:
+        print("캐시된 날씨 분석 결과를 사용합니다.")
+        return cached
+
+    print("Gemini API에 날씨 분석 요청 중...")
     current_try = 0
     while current_try <= max_retries:
         try:
             # Send the text to the model.
             # The model already knows the rules from the SYSTEM_PROMPT.
-            response = model.generate_content(user_prompt)
+            response = GEMINI_MODEL.generate_content(user_prompt)
             
             # The model, in JSON mode, should return a clean JSON string.
             # We parse it into a Python dictionary.
             result_json = json.loads(response.text)
+            cache_set(cache_key, result_json, GEMINI_CACHE_TTL_SECONDS)
             return result_json
 
         except ResourceExhausted as e:
@@ -89,8 +119,9 @@ def process_weather_info_with_gemini(data: Dict[str, Any], max_retries=3, delay_
                 print(f"Last error: {e}")
                 raise
             
-            print(f"[Warning] Rate limit exceeded. Waiting for {delay_seconds} seconds... (Attempt {current_try}/{max_retries})")
-            time.sleep(delay_seconds)
+            wait_seconds = get_retry_delay_seconds(e, current_try, delay_seconds)
+            print(f"[Warning] Rate limit exceeded. Waiting for {wait_seconds:.1f} seconds... (Attempt {current_try}/{max_retries})")
+            time.sleep(wait_seconds)
         
         except json.JSONDecodeError as e:
             # The model returned invalid JSON
@@ -113,6 +144,26 @@ URL_WEATHER = "https://api.openweathermap.org/data/3.0/onecall"
 URL_POLLUTION = "https://api.openweathermap.org/data/2.5/air_pollution"
 URL_GEO_REVERSE = "http://api.openweathermap.org/geo/1.0/reverse"
 
+# 같은 호스트로의 반복 요청에서 TCP/TLS 연결을 재사용하기 위한 공유 세션
+SESSION = create_session(API_RETRY)
+
+def _get_owm_json(url: str, params: Dict[str, Any], ttl_seconds: int):
+    """
+    OpenWeatherMap API를 호출하되, 같은 엔드포인트/좌표(소수점 3자리)에 대한
+    최근 응답이 캐시에 있으면 그 값을 반환합니다.
+    """
+    cache_key = make_cache_key("owm", url, f"{float(params['lat']):.3f}", f"{float(params['lon']):.3f}")
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+    response = SESSION.get(url, params=params)
+    response.raise_for_status() # 오류 발생 시 예외 처리
+    result = response.json()
+    # 빈 응답(예: 지명을 찾지 못한 역지오코딩 결과)은 캐시하지 않고 다음 호출에서 다시 시도합니다.
+    if result:
+        cache_set(cache_key, result, ttl_seconds)
+    return result
+
 def get_location_name(lat: float, lon: float, api_key: str) -> str:
     """
     One Call API 3.0을 호출하여 현재 위치 이름을 가져옵니다.
@@ -124,9 +175,7 @@ def get_location_name(lat: float, lon: float, api_key: str) -> str:
         "appid": api_key,
         "limit": 1,
     }
-    response = requests.get(URL_GEO_REVERSE, params=params)
-    response.raise_for_status() # 오류 발생 시 예외 처리
-    city_info = response.json()[0]
+    city_info = _get_owm_json(URL_GEO_REVERSE, params, GEO_REVERSE_CACHE_TTL_SECONDS)[0]
     return city_info["local_names"]["kr"] if "kr" in city_info["local_names"] else city_info["name"]
 
 def get_weather_data(lat: float, lon: float, api_key: str) -> Dict[str, Any]:
@@ -142,9 +191,7 @@ def get_weather_data(lat: float, lon: float, api_key: str) -> Dict[str, Any]:
         "lang": "kr",       # 한국어
         "exclude": "minutely,hourly"
     }
-    response = requests.get(URL_WEATHER, params=params)
-    response.raise_for_status() # 오류 발생 시 예외 처리
-    return response.json()
+    return _get_owm_json(URL_WEATHER, params, WEATHER_CACHE_TTL_SECONDS)
 
 def get_air_pollution_data(lat: float, lon: float, api_key: str) -> Dict[str, Any]:
     """
@@ -156,60 +203,71 @@ def get_air_pollution_data(lat: float, lon: float, api_key: str) -> Dict[str, An
         "lon": lon,
         "appid": api_key
     }
-    response = requests.get(URL_POLLUTION, params=params)
-    response.raise_for_status() # 오류 발생 시 예외 처리
-    return response.json()
+    return _get_owm_json(URL_POLLUTION, params, POLLUTION_CACHE_TTL_SECONDS)
 
 # OWM 대기질 등급 (1~5)과 사용자 요청 (좋음~매우나쁨) 매핑
 POLLUTANT_LEVEL_MAP = {1: "좋음", 2: "보통", 3: "경계", 4: "나쁨", 5: "매우 나쁨"}
 
+# 오염물질별 등급 경계값 (μg/m³). 값이 경계값 미만이면 해당 등급, 마지막 경계값 이상이면 5등급입니다.
+PM2_5_THRESHOLDS = (10, 25, 50, 75)
+PM10_THRESHOLDS = (20, 50, 100, 200)
+SO2_THRESHOLDS = (20, 80, 250, 350)
+NO2_THRESHOLDS = (40, 70, 150, 200)
+O3_THRESHOLDS = (60, 100, 140, 180)
+CO_THRESHOLDS = (4400, 9400, 12400, 15400)
+
+# 등급 인덱스(0~4) -> 등급 문자열
+POLLUTANT_LEVEL_NAMES = np.array([POLLUTANT_LEVEL_MAP[level] for level in range(1, 6)])
+
+# get_pollutant_levels가 받는 값의 순서와 그에 대응하는 (6, 4) 경계값 행렬
+POLLUTANT_ORDER = ("pm2_5", "pm10", "co", "o3", "no2", "so2")
+POLLUTANT_THRESHOLDS = np.array([
+    PM2_5_THRESHOLDS,
+    PM10_THRESHOLDS,
+    CO_THRESHOLDS,
+    O3_THRESHOLDS,
+    NO2_THRESHOLDS,
+    SO2_THRESHOLDS,
+], dtype=np.float64)
+
+def get_pollutant_levels(values) -> np.ndarray:
+    """
+    POLLUTANT_ORDER 순서의 오염물질 값 배열을 한 번에 등급 문자열 배열로 변환합니다.
+    마지막 축의 길이가 6인 배열이면 되므로, 시간대별 값 (N, 6) 배열도 그대로 처리할 수 있습니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    indices = np.empty(values.shape, dtype=np.intp)
+    for i, thresholds in enumerate(POLLUTANT_THRESHOLDS):
+        indices[..., i] = np.digitize(values[..., i], thresholds, right=False)
+    return POLLUTANT_LEVEL_NAMES[indices]
+
+def _get_pollutant_level(value: float, thresholds) -> str:
+    """정렬된 경계값에서 value가 속한 구간을 찾아 등급 문자열을 반환"""
+    return str(POLLUTANT_LEVEL_NAMES[np.digitize(value, thresholds, right=False)])
+
 def get_pm2_5_level(value: float) -> str:
     """PM2.5 (미세먼지) μg/m³ 기준 등급 반환"""
-    if value < 10: return POLLUTANT_LEVEL_MAP[1]
-    if value < 25: return POLLUTANT_LEVEL_MAP[2]
-    if value < 50: return POLLUTANT_LEVEL_MAP[3]
-    if value < 75: return POLLUTANT_LEVEL_MAP[4]
-    return POLLUTANT_LEVEL_MAP[5]
+    return _get_pollutant_level(value, PM2_5_THRESHOLDS)
 
 def get_pm10_level(value: float) -> str:
     """PM10 (초미세먼지) μg/m³ 기준 등급 반환"""
-    if value < 20: return POLLUTANT_LEVEL_MAP[1]
-    if value < 50: return POLLUTANT_LEVEL_MAP[2]
-    if value < 100: return POLLUTANT_LEVEL_MAP[3]
-    if value < 200: return POLLUTANT_LEVEL_MAP[4]
-    return POLLUTANT_LEVEL_MAP[5]
+    return _get_pollutant_level(value, PM10_THRESHOLDS)
 
 def get_so2_level(value: float) -> str:
     """SO2 (이산화황) μg/m³ 기준 등급 반환"""
-    if value < 20: return POLLUTANT_LEVEL_MAP[1]
-    if value < 80: return POLLUTANT_LEVEL_MAP[2]
-    if value < 250: return POLLUTANT_LEVEL_MAP[3]
-    if value < 350: return POLLUTANT_LEVEL_MAP[4]
-    return POLLUTANT_LEVEL_MAP[5]
+    return _get_pollutant_level(value, SO2_THRESHOLDS)
 
 def get_no2_level(value: float) -> str:
     """NO2 (이산화질소) μg/m³ 기준 등급 반환"""
-    if value < 40: return POLLUTANT_LEVEL_MAP[1]
-    if value < 70: return POLLUTANT_LEVEL_MAP[2]
-    if value < 150: return POLLUTANT_LEVEL_MAP[3]
-    if value < 200: return POLLUTANT_LEVEL_MAP[4]
-    return POLLUTANT_LEVEL_MAP[5]
+    return _get_pollutant_level(value, NO2_THRESHOLDS)
 
 def get_o3_level(value: float) -> str:
     """O3 (오존) μg/m³ 기준 등급 반환"""
-    if value < 60: return POLLUTANT_LEVEL_MAP[1]
-    if value < 100: return POLLUTANT_LEVEL_MAP[2]
-    if value < 140: return POLLUTANT_LEVEL_MAP[3]
-    if value < 180: return POLLUTANT_LEVEL_MAP[4]
-    return POLLUTANT_LEVEL_MAP[5]
+    return _get_pollutant_level(value, O3_THRESHOLDS)
 
 def get_co_level(value: float) -> str:
     """CO (일산화탄소) μg/m³ 기준 등급 반환"""
-    if value < 4400: return POLLUTANT_LEVEL_MAP[1]
-    if value < 9400: return POLLUTANT_LEVEL_MAP[2]
-    if value < 12400: return POLLUTANT_LEVEL_MAP[3]
-    if value < 15400: return POLLUTANT_LEVEL_MAP[4]
-    return POLLUTANT_LEVEL_MAP[5]
+    return _get_pollutant_level(value, CO_THRESHOLDS)
 
 def parse_combined_data(current_location: str, weather_data: Dict[str, Any], pollution_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -233,6 +291,11 @@ def parse_combined_data(current_location: str, weather_data: Dict[str, Any], pol
     val_no = components.get("no", 0.0)
     val_nh3 = components.get("nh3", 0.0)
 
+    # 등급표가 있는 오염물질들은 한 번에 등급을 계산합니다. (POLLUTANT_ORDER 순서)
+    level_pm2_5, level_pm10, level_co, level_o3, level_no2, level_so2 = get_pollutant_levels(
+        [val_pm2_5, val_pm10, val_co, val_o3, val_no2, val_so2]
+    )
+
     # 강우량, 강설량 (없을 경우 0)
     rainfall_mm = today_forecast.get("rain", 0.0)
     snowfall_mm = today_forecast.get("snow", 0.0)
@@ -259,12 +322,12 @@ def parse_combined_data(current_location: str, weather_data: Dict[str, Any], pol
 
         "대기질 지수 (AQI)": f"{air_quality['main']['aqi']} ({aqi_map.get(air_quality['main']['aqi'])})",
         # 등급표(이미지) 기준이 있는 항목들
-        "미세먼지 (PM2.5)": f"{val_pm2_5:.2f} μg/m³ ({get_pm2_5_level(val_pm2_5)})",
-        "초미세먼지 (PM10)": f"{val_pm10:.2f} μg/m³ ({get_pm10_level(val_pm10)})",
-        "일산화탄소 (CO)": f"{val_co:.2f} μg/m³ ({get_co_level(val_co)})",
-        "오존 (O3)": f"{val_o3:.2f} μg/m³ ({get_o3_level(val_o3)})",
-        "이산화질소 (NO2)": f"{val_no2:.2f} μg/m³ ({get_no2_level(val_no2)})",
-        "이산화황 (SO2)": f"{val_so2:.2f} μg/m³ ({get_so2_level(val_so2)})",
+        "미세먼지 (PM2.5)": f"{val_pm2_5:.2f} μg/m³ ({level_pm2_5})",
+        "초미세먼지 (PM10)": f"{val_pm10:.2f} μg/m³ ({level_pm10})",
+        "일산화탄소 (CO)": f"{val_co:.2f} μg/m³ ({level_co})",
+        "오존 (O3)": f"{val_o3:.2f} μg/m³ ({level_o3})",
+        "이산화질소 (NO2)": f"{val_no2:.2f} μg/m³ ({level_no2})",
+        "이산화황 (SO2)": f"{val_so2:.2f} μg/m³ ({level_so2})",
         
         # 참고: NO, NH3는 OWM 등급표에 기준이 없습니다.
         "일산화질소 (NO, μg/m³)": f"{val_no:.2f}", 
@@ -276,13 +339,17 @@ def parse_combined_data(current_location: str, weather_data: Dict[str, Any], pol
 def get_and_parse_data(lat: float, lon: float,):
     print(f"{lat}, {lon}")
     try:
-        current_location = get_location_name(lat, lon, API_KEY)
-
-        # 1. 날씨 정보 API 호출
-        weather_json = get_weather_data(lat, lon, API_KEY)
-        
-        # 2. 대기 오염 API 호출
-        pollution_json = get_air_pollution_data(lat, lon, API_KEY)
+        # 위치, 날씨, 대기 오염 API는 서로 독립적이므로 동시에 호출합니다.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            location_future = executor.submit(get_location_name, lat, lon, API_KEY)
+            # 1. 날씨 정보 API 호출
+            weather_future = executor.submit(get_weather_data, lat, lon, API_KEY)
+            # 2. 대기 오염 API 호출
+            pollution_future = executor.submit(get_air_pollution_data, lat, lon, API_KEY)
+
+            current_location = location_future.result()
+            weather_json = weather_future.result()
+            pollution_json = pollution_future.result()
         
         # 3. 두 데이터 조합 및 파싱
         final_data = parse_combined_data(current_location, weather_json, pollution_json)
@@ -301,8 +368,55 @@ def get_and_parse_data(lat: float, lon: float,):
     except Exception:
         raise
 
+@functools.lru_cache(maxsize=1024)
+def _markdownify_cached(text: str) -> str:
+    # "좋음", 숫자 등 같은 값이 반복되므로 markdownify 결과를 재사용합니다.
+    return telegramify_markdown.markdownify(text).strip()
+
 def escape_mdv2(text):
-    return telegramify_markdown.markdownify(str(text)).strip()
+    return _markdownify_cached(str(text))
+
+# 이스케이프된 하이픈 25개
+WEATHER_MESSAGE_SEPARATOR = r'\-' * 25
+
+# 텔레그램 MarkdownV2 날씨 메시지 템플릿
+# *_section 값들은 내용이 있을 때만 채워지는 선택 항목입니다.
+WEATHER_MESSAGE_TEMPLATE = (
+    # 헤더
+    "*{location} 날씨 브리핑* 🌦\n"
+    "*{summary}*\n"
+    # 제안 (가장 중요) + 경보 (있을 경우)
+    "\n{suggestion}{alert_section}\n"
+    "\n{separator}\n\n"
+    # 주요 날씨
+    "*오늘의 날씨* 🌡️\n"
+    "• *날씨*: {weather}\n"
+    "• *기온*: {temp_min}°C / {temp_max}°C\n"
+    "• *현재 체감*: {feels_now}°C\n"
+    "• *강수 확률*: {rain_prob}%{rain_section}{snow_section}\n"
+    # 대기 질 (키 이름의 특수문자(., 2.5)는 직접 이스케이프 처리)
+    "\n*대기 질* 🍃\n"
+    "• *종합*: {aqi}\n"
+    "• *미세\\(PM2\\.5\\)*: {pm25}\n"
+    "• *초미세\\(PM10\\)*: {pm10}\n"
+    "• *오존\\(O3\\)*: {o3}\n"
+    # 세부 정보 (스포일러)
+    "\n{separator}\n\n"
+    "||\n"
+    "*세부 정보 \\(날씨\\)*\n"
+    "• 자외선 \\(UVI\\): {uvi}\n"
+    "• 습도: {humidity}%\n"
+    "• 바람: {wind}\n"
+    "• 오늘 체감: {feels_today}\n"
+    "• 가시거리: {visibility}m\n"
+    "\n*세부 정보 \\(대기\\)*\n"
+    "• CO: {co}\n"
+    "• NO2: {no2}\n"
+    "• SO2: {so2}\n"
+    "• NO: {no}\n"
+    "• NH3: {nh3}\n"
+    "||"
+)
 
 def format_weather_for_telegram(data: dict) -> str:
     """날씨 딕셔너리를 텔레그램 MarkdownV2 문자열로 변환합니다."""
@@ -313,112 +427,55 @@ def format_weather_for_telegram(data: dict) -> str:
     def get_escaped(key, default="N/A"):
         return escape_mdv2(data.get(key, default))
 
-    # 섹션 1: 핵심 요약
-    location = get_escaped('위치')
-    summary = get_escaped('요약')
-    suggestion = get_escaped('제안')
-
-    # 섹션 2: 경보 (내용이 있을 때만 표시)
+    # 경보 (내용이 있을 때만 표시)
     alert = data.get('경보', '')
-    alert_message = ""
+    alert_section = ""
     if alert:
-        alert_message = (
-            f"\n\n*🚨 경보 🚨*\n"
+        alert_section = (
+            f"\n\n\n*🚨 경보 🚨*\n"
             f"_{escape_mdv2(alert)}_\n"
         )
 
-    # 섹션 3: 주요 날씨
-    weather = get_escaped('오늘 날씨')
-    temp_max = get_escaped('최고 기온 (°C)')
-    temp_min = get_escaped('최저 기온 (°C)')
-    feels_now = get_escaped('현재 체감기온 (°C)')
-    rain_prob = get_escaped('오늘 강수 확률 (%)')
-    
     # 0.0이 아닌 강수/강설량만 표시
     rain_amount = data.get('오늘 강우량 (mm)', 0.0)
     snow_amount = data.get('오늘 강설량 (mm)', 0.0)
-
-    # 섹션 4: 대기 질
-    aqi = get_escaped('대기질 지수 (AQI)')
-    # 키 이름에 '.'이 있으므로 수동으로 이스케이프
-    pm25_key = '미세먼지 (PM2.5)'
-    pm10_key = '초미세먼지 (PM10)'
-    pm25 = get_escaped(pm25_key)
-    pm10 = get_escaped(pm10_key)
-    o3 = get_escaped('오존 (O3)')
-
-    # 섹션 5: 세부 정보 (스포일러 처리)
-    uvi = get_escaped('오늘 자외선 지수 (UVI)')
-    humidity = get_escaped('오늘 습도 (%)')
-    wind = get_escaped('오늘 풍속 (m/s)')
-    feels_today = get_escaped('오늘 체감기온 (°C)')
-    visibility = get_escaped('현재 가시거리 (m)')
-    
-    # 나머지 오염물질
-    co = get_escaped('일산화탄소 (CO)')
-    no2 = get_escaped('이산화질소 (NO2)')
-    so2 = get_escaped('이산화황 (SO2)')
-    no = get_escaped('일산화질소 (NO, μg/m³)')
-    nh3 = get_escaped('암모니아 (NH3, μg/m³)')
-
-    # --- MarkdownV2 문자열 조합 ---
-    
-    message_parts = []
-    
-    # 헤더
-    message_parts.append(f"*{location.strip()} 날씨 브리핑* 🌦")
-    message_parts.append(f"*{summary}*")
-    
-    # 제안 (가장 중요)
-    message_parts.append(f"\n{suggestion}")
-    
-    # 경보 (있을 경우)
-    if alert_message:
-        message_parts.append(alert_message)
-
-    # 구분선
-    separator = r'\-' * 25  # 이스케이프된 하이픈 25개
-    message_parts.append(f"\n{separator}\n")
-
-    # 주요 날씨
-    message_parts.append(f"*오늘의 날씨* 🌡️")
-    message_parts.append(f"• *날씨*: {weather}")
-    message_parts.append(f"• *기온*: {temp_min}°C / {temp_max}°C")
-    message_parts.append(f"• *현재 체감*: {feels_now}°C")
-    message_parts.append(f"• *강수 확률*: {rain_prob}%")
-    if rain_amount > 0:
-        message_parts.append(f"• *강우량*: {escape_mdv2(rain_amount)}mm")
-    if snow_amount > 0:
-        message_parts.append(f"• *강설량*: {escape_mdv2(snow_amount)}mm")
-
-    # 대기 질
-    message_parts.append(f"\n*대기 질* 🍃")
-    message_parts.append(f"• *종합*: {aqi}")
-    # 키 이름의 특수문자(., 2.5)는 직접 이스케이프 처리
-    message_parts.append(f"• *미세\(PM2\.5\)*: {pm25}")
-    message_parts.append(f"• *초미세\(PM10\)*: {pm10}")
-    message_parts.append(f"• *오존\(O3\)*: {o3}")
-
-    # 세부 정보 (스포일러)
-    message_parts.append(f"\n{separator}\n")
-    message_parts.append(f"||") # 스포일러 시작
-    message_parts.append(f"*세부 정보 \(날씨\)*")
-    message_parts.append(f"• 자외선 \(UVI\): {uvi}")
-    message_parts.append(f"• 습도: {humidity}%")
-    message_parts.append(f"• 바람: {wind}")
-    message_parts.append(f"• 오늘 체감: {feels_today}")
-    message_parts.append(f"• 가시거리: {visibility}m")
-    
-    message_parts.append(f"\n*세부 정보 \(대기\)*")
-    message_parts.append(f"• CO: {co}")
-    message_parts.append(f"• NO2: {no2}")
-    message_parts.append(f"• SO2: {so2}")
-    message_parts.append(f"• NO: {no}")
-    message_parts.append(f"• NH3: {nh3}")
-    message_parts.append(f"||") # 스포일러 끝
-
-    # 모든 부분을 개행 문자로 연결
-    return "\n".join(message_parts)
+    rain_section = f"\n• *강우량*: {escape_mdv2(rain_amount)}mm" if rain_amount > 0 else ""
+    snow_section = f"\n• *강설량*: {escape_mdv2(snow_amount)}mm" if snow_amount > 0 else ""
+
+    fields = defaultdict(str, {
+        # 섹션 1: 핵심 요약
+        "location": get_escaped('위치').strip(),
+        "summary": get_escaped('요약'),
+        "suggestion": get_escaped('제안'),
+        "alert_section": alert_section,
+        "separator": WEATHER_MESSAGE_SEPARATOR,
+        # 섹션 2: 주요 날씨
+        "weather": get_escaped('오늘 날씨'),
+        "temp_max": get_escaped('최고 기온 (°C)'),
+        "temp_min": get_escaped('최저 기온 (°C)'),
+        "feels_now": get_escaped('현재 체감기온 (°C)'),
+        "rain_prob": get_escaped('오늘 강수 확률 (%)'),
+        "rain_section": rain_section,
+        "snow_section": snow_section,
+        # 섹션 3: 대기 질
+        "aqi": get_escaped('대기질 지수 (AQI)'),
+        "pm25": get_escaped('미세먼지 (PM2.5)'),
+        "pm10": get_escaped('초미세먼지 (PM10)'),
+        "o3": get_escaped('오존 (O3)'),
+        # 섹션 4: 세부 정보 (스포일러 처리)
+        "uvi": get_escaped('오늘 자외선 지수 (UVI)'),
+        "humidity": get_escaped('오늘 습도 (%)'),
+        "wind": get_escaped('오늘 풍속 (m/s)'),
+        "feels_today": get_escaped('오늘 체감기온 (°C)'),
+        "visibility": get_escaped('현재 가시거리 (m)'),
+        # 나머지 오염물질
+        "co": get_escaped('일산화탄소 (CO)'),
+        "no2": get_escaped('이산화질소 (NO2)'),
+        "so2": get_escaped('이산화황 (SO2)'),
+        "no": get_escaped('일산화질소 (NO, μg/m³)'),
+        "nh3": get_escaped('암모니아 (NH3, μg/m³)'),
+    })
+    return WEATHER_MESSAGE_TEMPLATE.format_map(fields)
 
 def get_weather_message(lat: float, lon: float):
     try:
@@ -0,0 +1,19 @@
+# 뉴스/날씨 스크립트가 함께 사용하는 requests 세션 생성. (import 시 부수 효과가 없어야 합니다)
+# u/rapaellk (뉴스 스크립트)와 f/telegram_life_bot (날씨/봇 스크립트)에 각각 배포합니다.
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# API 호출의 일시적인 오류(연결 실패, 429, 5xx)에 대한 재시도 정책
+API_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+
+def create_session(max_retries=0) -> requests.Session:
+    """
+    같은 호스트로의 반복 요청에서 TCP/TLS 연결을 재사용하는 세션을 만듭니다.
+    max_retries에 urllib3 Retry 정책을 주면 이 세션의 모든 요청에 적용됩니다. (기본값: 재시도 없음)
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
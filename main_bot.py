@@ -8,6 +8,7 @@ import telegramify_markdown     # subway_handlers.py 가 사용
 import pytz                     # subway_handlers.py 와 weather_handlers.py 가 사용
 import holidayskr               # used by get_weather
 import geopy                    # used by get_weather
+import numpy                    # used by get_weather
 import google.generativeai as genai # used by get_weather
 from google.api_core.exceptions import ResourceExhausted # used by get_weather
 import trafilatura # used by summarize_to_memos_handler
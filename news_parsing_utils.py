@@ -1,16 +1,137 @@
 import wmill
-from typing import TypedDict
+from typing import TypedDict, Optional
 import requests
 import telegramify_markdown
 import google.generativeai as genai
 import json
+import re
+import unicodedata
+import ssl
+import urllib.request
 import time
+import threading
+from collections import deque
 from google.api_core.exceptions import ResourceExhausted
 import trafilatura
-from bs4 import BeautifulSoup
+from selectolax.parser import HTMLParser
 from tavily import TavilyClient
+from deep_translator import GoogleTranslator
+import feedparser
+from io import BytesIO
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from lxml import etree
+
+from u.rapaellk.cache_utils import make_cache_key, cache_get, cache_set
+from u.rapaellk.http_utils import create_session, API_RETRY
+from u.rapaellk.retry_utils import get_retry_delay_seconds
 
 genai.configure(api_key=wmill.get_variable("u/rapaellk/googleai_api_key_free"))
+GEMINI_MODEL_NAME = 'gemini-2.5-flash'
+
+# This system prompt contains all the logic you requested.
+# The model will follow these rules.
+SYSTEM_PROMPT = """
+You are a text processing expert. Your task is to process the given plain English text and return a JSON object.
+
+Follow these steps precisely:
+1.  Count the number of sentences in the input text.
+2.  Apply logic based on the sentence count:
+    -   **If 2 sentences or fewer:** The 'english' field in the JSON must be the original text, exactly as it is.
+    -   **If 3 sentences or more:** The 'english' field in the JSON must be a concise, one-or-two-sentence summary of the text.
+3.  Translate the content of the 'english' field (whether it's the original text or the summary) into Korean. Put this translation in the 'korean' field.
+4.  Return *only* the final JSON object, with the exact schema: {"english": "...", "korean": "..."}.
+    Do not include any other text, explanations, or markdown delimiters (like ```json).
+"""
+
+# Configure the model to use the system prompt and JSON output mode.
+# Built once at import time and reused by every call.
+GEMINI_MODEL = genai.GenerativeModel(
+    GEMINI_MODEL_NAME,
+    system_instruction=SYSTEM_PROMPT,
+    generation_config={
+        "response_mime_type": "application/json",
+        "temperature": 0.0  # <-- Add this line for maximum predictability
+    }
+)
+
+# 같은 호스트로의 반복 요청에서 TCP/TLS 연결을 재사용하기 위한 공유 세션
+# HN, 텔레그램 등 API 호출용이며 일시적인 오류는 재시도합니다.
+SESSION = create_session(API_RETRY)
+# 임의의 기사/피드 다운로드용 세션. 응답 없는 사이트나 긴 Retry-After 때문에
+# 스레드 풀의 워커가 오래 묶이지 않도록 재시도하지 않고 timeout만 적용합니다.
+FETCH_SESSION = create_session()
+
+# 뉴스 스크립트들이 항목별 본문 수집 + Gemini 요약에 사용하는 스레드 수.
+# I/O 대기가 대부분이므로 스레드로 병렬 처리합니다.
+MAX_WORKERS = 8
+
+# 캐시 유효 시간 (캐시 자체는 cache_utils 참고)
+CONTENT_CACHE_TTL_SECONDS = 3 * 24 * 60 * 60  # 3일
+GEMINI_CACHE_TTL_SECONDS = 24 * 60 * 60  # 1일
+
+# HTML is stripped with selectolax and these cover the common Markdown syntax,
+# so Gemini doesn't spend input tokens on markup.
+# Only paired delimiters are removed, so identifiers like __init__ or x**2 survive.
+_MARKDOWN_LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MARKDOWN_CODE_FENCE_RE = re.compile(r'^\s*```.*$\n?', re.MULTILINE)
+_MARKDOWN_CODE_SPAN_RE = re.compile(r'`([^`\n]+)`')
+_MARKDOWN_BOLD_RE = re.compile(r'(?<![\w*])\*\*(?=\S)(.+?)(?<=\S)\*\*(?![\w*])')
+# "__" emphasis must wrap words with whitespace inside, unlike dunder names.
+_MARKDOWN_UNDERLINE_BOLD_RE = re.compile(r'(?<!\w)__(?=\S)([^_]*?\s[^_]*?)(?<=\S)__(?!\w)')
+_MARKDOWN_HEADING_RE = re.compile(r'^#{1,6}\s+', re.MULTILINE)
+
+def clean_text_for_gemini(text: str) -> str:
+    """
+    Removes HTML tags and Markdown syntax (e.g. **, #, [text](link)) and returns plain text.
+    """
+    text = remove_html_tags_bs4(text)
+    text = _MARKDOWN_LINK_RE.sub(r'\1', text)
+    text = _MARKDOWN_CODE_FENCE_RE.sub('', text)
+    text = _MARKDOWN_CODE_SPAN_RE.sub(r'\1', text)
+    text = _MARKDOWN_BOLD_RE.sub(r'\1', text)
+    text = _MARKDOWN_UNDERLINE_BOLD_RE.sub(r'\1', text)
+    text = _MARKDOWN_HEADING_RE.sub('', text)
+    return text.strip()
+
+# Sentence boundaries used to detect texts that Gemini would return unchanged.
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?。！？]+\s')
+SHORT_TEXT_MAX_LENGTH = 500
+# Share of Latin letters required to treat a text as English.
+# Punctuation such as curly quotes, em dashes and "…" isn't counted as a letter.
+MIN_LATIN_LETTER_RATIO = 0.95
+
+def _count_sentences(text: str) -> int:
+    return len([part for part in _SENTENCE_SPLIT_RE.split(text) if part.strip()])
+
+def _is_latin_text(text: str) -> bool:
+    letters = [c for c in text if c.isalpha()]
+    if not letters:
+        return False
+    latin_letters = sum(1 for c in letters if unicodedata.name(c, "").startswith("LATIN"))
+    return latin_letters / len(letters) >= MIN_LATIN_LETTER_RATIO
+
+def _process_short_english_text(cleaned):
+    """
+    Handles the SYSTEM_PROMPT's "2 sentences or fewer" case without calling Gemini.
+
+    Short English texts (already cleaned by clean_text_for_gemini) are returned
+    as-is in 'english', so only a translation is needed. Returns None when the
+    text doesn't qualify or translation fails, in which case the caller falls
+    back to Gemini.
+    """
+    if not cleaned or len(cleaned) > SHORT_TEXT_MAX_LENGTH or not _is_latin_text(cleaned):
+        return None
+    if _count_sentences(cleaned) > 2:
+        return None
+    try:
+        korean = GoogleTranslator(source="en", target="ko").translate(cleaned)
+    except Exception as e:
+        print(f"[Warning] Translation failed, falling back to Gemini: {e}")
+        return None
+    if not korean:
+        return None
+    return {"english": cleaned, "korean": korean}
 
 def process_text_with_gemini(text_input, max_retries=3, delay_seconds=60):
     """
@@ -19,50 +140,43 @@ def process_text_with_gemini(text_input, max_retries=3, delay_seconds=60):
     It follows the logic in SYSTEM_PROMPT and handles rate limiting.
     
     Args:
-        text_input (str): The raw English text to process.
+        text_input (str): The raw English text to process. HTML and Markdown are stripped before sending.
         max_retries (int): Max number of retries on rate limit errors.
-        delay_seconds (int): Seconds to wait between retries.
+        delay_seconds (int): Upper bound in seconds for the backoff between retries.
 
     Returns:
         dict: A dictionary in the format {'english': '...', 'korean': '...'}
-              or None if processing fails after retries.
-    """
-
-    # This system prompt contains all the logic you requested.
-    # The model will follow these rules.
-    SYSTEM_PROMPT = """
-    You are a text processing expert. Your task is to process the given English text and return a JSON object.
-
-    Follow these steps precisely:
-    1.  First, clean the input text by removing all XML, HTML, and Markdown syntax (e.g., tags like <p>, <div>, and markers like **, #, [text](link)). Get the raw, plain text content.
-    2.  Count the number of sentences in this *cleaned* plain text.
-    3.  Apply logic based on the sentence count:
-        -   **If 2 sentences or fewer:** The 'english' field in the JSON must be the original *cleaned* text, exactly as it is.
-        -   **If 3 sentences or more:** The 'english' field in the JSON must be a concise, one-or-two-sentence summary of the *cleaned* text.
-    4.  Translate the content of the 'english' field (whether it's the original text or the summary) into Korean. Put this translation in the 'korean' field.
-    5.  Return *only* the final JSON object, with the exact schema: {"english": "...", "korean": "..."}.
-        Do not include any other text, explanations, or markdown delimiters (like ```json).
-    """
-
-    # Configure the model to use the system prompt and JSON output mode
-    model = genai.GenerativeModel(
-        'gemini-2.5-flash',
-        system_instruction=SYSTEM_PROMPT,
-        generation_config={
-            "response_mime_type": "application/json",
-            "temperature": 0.0  # <-- Add this line for maximum predictability
-        }
-    )
+              or None if no text is left after cleaning (e.g. image-only HTML).
+    """
+
+    text_input = clean_text_for_gemini(text_input)
+    # Gemini rejects empty input, so markup without any text is treated as missing content.
+    if not text_input:
+        return None
+
+    # Identical inputs (e.g. republished articles) reuse the previous result.
+    cache_key = make_cache_key("gemini", GEMINI_MODEL_NAME, SYSTEM_PROMPT, text_input)
+    cached = cache_get(cache_key)
+    if cached:
+        return cached
+
+    # Short English texts only need a translation, so skip the Gemini call.
+    short_result = _process_short_english_text(text_input)
+    if short_result:
+        cache_set(cache_key, short_result, GEMINI_CACHE_TTL_SECONDS)
+        return short_result
+
     current_try = 0
     while current_try <= max_retries:
         try:
             # Send the text to the model.
             # The model already knows the rules from the SYSTEM_PROMPT.
-            response = model.generate_content(text_input)
+            response = GEMINI_MODEL.generate_content(text_input)
             
             # The model, in JSON mode, should return a clean JSON string.
             # We parse it into a Python dictionary.
             result_json = json.loads(response.text)
+            cache_set(cache_key, result_json, GEMINI_CACHE_TTL_SECONDS)
             return result_json
 
         except ResourceExhausted as e:
@@ -73,8 +187,9 @@ def process_text_with_gemini(text_input, max_retries=3, delay_seconds=60):
                 print(f"Last error: {e}")
                 raise
             
-            print(f"[Warning] Rate limit exceeded. Waiting for {delay_seconds} seconds... (Attempt {current_try}/{max_retries})")
-            time.sleep(delay_seconds)
+            wait_seconds = get_retry_delay_seconds(e, current_try, delay_seconds)
+            print(f"[Warning] Rate limit exceeded. Waiting for {wait_seconds:.1f} seconds... (Attempt {current_try}/{max_retries})")
+            time.sleep(wait_seconds)
         
         except json.JSONDecodeError as e:
             # The model returned invalid JSON
@@ -112,41 +227,74 @@ def split_string_by_lines(long_string: str, max_length: int = 4096) -> list[str]
     lines = long_string.splitlines(keepends=True)
     
     chunks = []
-    current_chunk = ""
+    # 문자열 += 반복은 매번 새 문자열을 만들므로 라인 리스트와 길이를 따로 관리하고,
+    # 청크를 확정할 때만 join 합니다.
+    current_parts = []
+    current_len = 0
     
     for line in lines:
+        line_len = len(line)
         # 2. 만약 한 줄 자체가 max_length보다 긴 경우 (예외 케이스)
         #    "라인을 자르지 않는다"는 규칙을 우선합니다.
-        if len(line) >= max_length:
+        if line_len >= max_length:
             # 현재까지 누적된 청크가 있다면 먼저 추가합니다.
-            if current_chunk:
-                chunks.append(current_chunk)
+            if current_parts:
+                chunks.append("".join(current_parts))
             
             # 이 긴 라인을 그 자체로 하나의 청크로 추가합니다.
             chunks.append(line)
             
             # 현재 청크를 리셋하고 다음 라인으로 넘어갑니다.
-            current_chunk = ""
+            current_parts = []
+            current_len = 0
             continue
             
         # 3. 현재 라인을 추가했을 때 max_length를 초과하는지 확인합니다.
-        if len(current_chunk) + len(line) >= max_length:
+        if current_len + line_len >= max_length:
             # 초과한다면, 현재까지의 청크를 리스트에 추가합니다.
-            if current_chunk: # 빈 문자열이 아닐 경우에만 추가
-                chunks.append(current_chunk)
+            if current_parts: # 빈 청크가 아닐 경우에만 추가
+                chunks.append("".join(current_parts))
             
             # 새 청크는 현재 라인으로 시작합니다.
-            current_chunk = line
+            current_parts = [line]
+            current_len = line_len
         else:
             # 4. max_length를 초과하지 않으면, 현재 청크에 라인을 누적합니다.
-            current_chunk += line
+            current_parts.append(line)
+            current_len += line_len
             
-    # 5. 마지막에 current_chunk에 남아있는 문자열이 있다면 추가합니다.
-    if current_chunk:
-        chunks.append(current_chunk)
+    # 5. 마지막에 남아있는 라인들이 있다면 추가합니다.
+    if current_parts:
+        chunks.append("".join(current_parts))
         
     return chunks
 
+class RateLimiter:
+    """
+    최근 period초 동안의 호출 시각을 기록하여, 그 안에 calls회를 넘게 호출하려 하면
+    여유가 생길 때까지 대기시키는 슬라이딩 윈도우 방식의 제한기입니다. (스레드 안전)
+    """
+    def __init__(self, calls: int, period: float):
+        self.calls = calls
+        self.period = period
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._timestamps and now - self._timestamps[0] >= self.period:
+                    self._timestamps.popleft()
+                if len(self._timestamps) < self.calls:
+                    self._timestamps.append(now)
+                    return
+                time.sleep(self.period - (now - self._timestamps[0]))
+
+# 텔레그램 봇 API의 초당 30건 제한보다 여유 있게 설정합니다.
+TELEGRAM_RATE_LIMITER = RateLimiter(calls=25, period=1)
+TELEGRAM_MAX_RETRIES = 3
+
 class telegram(TypedDict):
     token: str
 
@@ -162,7 +310,19 @@ def send_to_telegram(message: str, chat_id: int = int(wmill.get_variable("u/rapa
     }
     if reply_markup:
         payload["reply_markup"] = reply_markup
-    response = requests.post(telegram_url, data=payload)
+    for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+        TELEGRAM_RATE_LIMITER.acquire()
+        response = SESSION.post(telegram_url, data=payload)
+        if response.status_code != 429 or attempt == TELEGRAM_MAX_RETRIES:
+            break
+        # Flood control에 걸리면 텔레그램이 알려준 시간만큼 기다렸다가 다시 보냅니다.
+        # (프록시 등이 JSON이 아닌 429를 돌려줄 수도 있으므로 기본값 1초를 사용)
+        try:
+            retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+        except ValueError:
+            retry_after = 1
+        print(f"[Warning] Telegram rate limit exceeded. Waiting for {retry_after} seconds...")
+        time.sleep(retry_after)
     return response.json()
 
 HEADERS = {
@@ -171,8 +331,9 @@ HEADERS = {
 
 def send_long_message_to_telegram(message: str, chat_id: int = int(wmill.get_variable("u/rapaellk/telegram_chat_id")), token = wmill.get_resource("u/rapaellk/telegram_token_resource")):
     splitted_msg = split_string_by_lines(message)
+    # 순서대로 하나씩 보내므로, 중간 청크 전송이 실패하면 뒤 청크는 보내지 않습니다.
     for m in splitted_msg:
-        send_to_telegram(m, chat_id, token=token)
+        send_to_telegram(telegramify_markdown.markdownify(m), chat_id, True, token)
 
 def _get_content_from_link_tabily(url):
     try:
@@ -187,9 +348,18 @@ def _get_content_from_link_tabily(url):
         print(e)
         return None
 
+def _extract_text_from_html(downloaded_html):
+    return trafilatura.extract(
+        downloaded_html,
+        output_format='txt',      # 'txt' (기본값), 'json', 'xml' 등
+        include_comments=False,   # 댓글 제외
+        include_tables=False,     # 표(테이블) 제외
+        no_fallback=False         # 기본 추출 실패 시 다른 방법 시도
+    )
+
 def _get_content_from_link_trafilatura(url):
     try:
-        response = requests.get(
+        response = FETCH_SESSION.get(
             url, 
             headers=HEADERS,  # 준비된 헤더 사용
             timeout=10        # 10초 이상 걸리면 중단
@@ -201,13 +371,7 @@ def _get_content_from_link_trafilatura(url):
         if downloaded_html is None:
             print("Empty html")
             return None
-        full_text = trafilatura.extract(
-            downloaded_html,
-            output_format='txt',      # 'txt' (기본값), 'json', 'xml' 등
-            include_comments=False,   # 댓글 제외
-            include_tables=False,     # 표(테이블) 제외
-            no_fallback=False         # 기본 추출 실패 시 다른 방법 시도
-        )
+        full_text = _extract_text_from_html(downloaded_html)
         if not full_text:
             print("too short html")
             return None
@@ -217,16 +381,120 @@ def _get_content_from_link_trafilatura(url):
         return None
 
 def get_content_from_link(url):
+    cache_key = make_cache_key("content", url)
+    cached = cache_get(cache_key)
+    if cached:
+        return cached
     content = _get_content_from_link_trafilatura(url)
     if not content or len(content) < 100:
-        return _get_content_from_link_tabily(url)
+        content = _get_content_from_link_tabily(url)
+    if content:
+        cache_set(cache_key, content, CONTENT_CACHE_TTL_SECONDS)
+    return content
 
 def remove_html_tags_bs4(html_string):
     """
-    Removes HTML tags from a string using BeautifulSoup and extracts pure text.
+    Removes HTML tags from a string and extracts pure text.
+
+    Uses selectolax's C-based parser (much faster than BeautifulSoup's
+    pure-Python html.parser). The function name is kept for existing callers.
     """
-    soup = BeautifulSoup(html_string, 'html.parser')
-    return soup.get_text()
+    tree = HTMLParser(html_string)
+    if tree.body is None:
+        return ""
+    return tree.body.text()
+
+
+def _feed_element_text(element) -> str:
+    """요소의 내부 텍스트를 반환합니다. (XHTML 등 자식 요소가 있으면 마크업째 포함)"""
+    parts = [element.text or ""]
+    for child in element:
+        parts.append(etree.tostring(child, encoding="unicode"))
+    return "".join(parts).strip()
+
+def _parse_feed_date(value: str):
+    """RFC 822 (RSS) 또는 ISO 8601 (Atom) 날짜를 UTC struct_time으로 변환합니다."""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.utctimetuple()
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_RSS1_NS = "{http://purl.org/rss/1.0/}"
+_CONTENT_NS = "{http://purl.org/rss/1.0/modules/content/}"
+_DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+# (네임스페이스 포함) 태그 -> 항목 필드
+# media:title, media:content 등 다른 네임스페이스의 같은 이름 태그는 무시합니다.
+_FEED_FIELD_BY_TAG = {
+    "title": "title", _RSS1_NS + "title": "title", _ATOM_NS + "title": "title",
+    "link": "link", _RSS1_NS + "link": "link", _ATOM_NS + "link": "link",
+    "description": "description", _RSS1_NS + "description": "description", _ATOM_NS + "summary": "description",
+    _CONTENT_NS + "encoded": "content", _ATOM_NS + "content": "content",
+    "guid": "guid", _ATOM_NS + "id": "guid",
+    "pubDate": "published_parsed", _ATOM_NS + "published": "published_parsed", _DC_NS + "date": "published_parsed",
+}
+
+def _parse_feed_entry(element) -> feedparser.FeedParserDict:
+    """
+    RSS <item> 또는 Atom <entry> 하나를 feedparser와 같은 형태의 항목으로 변환합니다.
+    이 스크립트들이 사용하는 title, link, description, content, guid, published_parsed만 추출하며,
+    같은 필드가 여러 번 나오면 처음 값을 사용합니다.
+    """
+    entry = feedparser.FeedParserDict()
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue  # 주석, 처리 명령 등
+        field = _FEED_FIELD_BY_TAG.get(child.tag)
+        if field is None or field in entry:
+            continue
+        if field == "link":
+            # RSS는 텍스트로, Atom은 href 속성으로 링크를 제공합니다.
+            href = child.get("href")
+            if href is None:
+                entry["link"] = _feed_element_text(child)
+            elif child.get("rel", "alternate") == "alternate":
+                entry["link"] = href
+        elif field == "content":
+            entry["content"] = [feedparser.FeedParserDict(value=_feed_element_text(child))]
+        elif field == "published_parsed":
+            published_parsed = _parse_feed_date(_feed_element_text(child))
+            if published_parsed:
+                entry["published_parsed"] = published_parsed
+        else:
+            entry[field] = _feed_element_text(child)
+    return entry
+
+def parse_feed(feed_url: str, ssl_context: Optional[ssl.SSLContext] = None):
+    """
+    RSS/Atom 피드를 가져와 파싱합니다.
+
+    필요한 필드만 lxml.etree.iterparse로 빠르게 추출하고, 다운로드나 파싱에 실패하면
+    feedparser.parse로 대체합니다. 반환값은 feedparser와 마찬가지로 .entries를 가집니다.
+    ssl_context를 주면 그 피드에 대해서만 인증서 검증 설정을 바꿉니다.
+    (빠른 경로는 requests가 SSLContext를 받지 않으므로 verify=False로, feedparser 대체 경로는 그 컨텍스트로 요청합니다)
+    """
+    try:
+        response = FETCH_SESSION.get(feed_url, headers=HEADERS, timeout=10, verify=ssl_context is None)
+        response.raise_for_status()
+        entries = []
+        for _, element in etree.iterparse(BytesIO(response.content), events=("end",), tag=("{*}item", "{*}entry")):
+            entries.append(_parse_feed_entry(element))
+            element.clear()  # 이미 처리한 항목의 메모리를 해제합니다.
+        if entries:
+            return feedparser.FeedParserDict(entries=entries)
+        print(f"No entries found by fast parser, falling back to feedparser: {feed_url}")
+    except Exception as e:
+        print(f"Fast feed parsing failed, falling back to feedparser: {e}")
+    if ssl_context is not None:
+        return feedparser.parse(feed_url, handlers=[urllib.request.HTTPSHandler(context=ssl_context)])
+    return feedparser.parse(feed_url)
 
 
 def main(x: str):
@@ -0,0 +1,43 @@
+# Gemini 재시도 대기 시간 계산. (import 시 부수 효과가 없어야 합니다)
+# u/rapaellk (뉴스 스크립트)와 f/telegram_life_bot (날씨/봇 스크립트)에 각각 배포합니다.
+import random
+
+# Rate limit 재시도 시 지수 백오프의 첫 대기 시간 (초).
+# Gemini 무료 티어는 분 단위 쿼터이므로, 기본 3회 재시도가 약 1분 이상을 기다리도록 합니다. (15 -> 30 -> 60)
+BASE_RETRY_DELAY_SECONDS = 15
+
+def _parse_retry_delay(retry_delay):
+    """
+    RetryInfo의 retry_delay 값을 초 단위로 변환합니다.
+    gRPC는 Duration/timedelta 객체를, REST는 "37s" 같은 문자열을 돌려줍니다.
+    """
+    if retry_delay is None:
+        return None
+    if hasattr(retry_delay, "total_seconds"):
+        return retry_delay.total_seconds()
+    if hasattr(retry_delay, "seconds"):
+        return retry_delay.seconds + getattr(retry_delay, "nanos", 0) / 1e9
+    try:
+        return float(str(retry_delay).strip().rstrip("s"))
+    except ValueError:
+        return None
+
+def get_retry_delay_seconds(error, attempt: int, max_delay_seconds: float) -> float:
+    """
+    Gemini 호출이 Rate limit(ResourceExhausted)에 걸렸을 때 재시도 전 대기할 시간(초)을 반환합니다.
+
+    서버가 RetryInfo로 대기 시간을 알려주면 그 값을 따르고, 아니면 max_delay_seconds를
+    상한으로 하는 지수 백오프를 사용합니다. 병렬 작업들이 동시에 재시도하지 않도록 지터를 더합니다.
+    """
+    jitter = random.uniform(0, 2)
+    for detail in getattr(error, "details", None) or []:
+        if isinstance(detail, dict):
+            # REST 전송: {"@type": ".../google.rpc.RetryInfo", "retryDelay": "37s"}
+            retry_delay = detail.get("retryDelay", detail.get("retry_delay"))
+        else:
+            # gRPC 전송: google.rpc.RetryInfo 메시지
+            retry_delay = getattr(detail, "retry_delay", None)
+        delay = _parse_retry_delay(retry_delay)
+        if delay is not None:
+            return delay + jitter
+    return min(max_delay_seconds, BASE_RETRY_DELAY_SECONDS * 2 ** (attempt - 1)) + jitter
@@ -27,42 +27,50 @@ except ImportError:
     # 로컬 테스트 등을 위한 fallback
     from common_handlers import cancel
 
+try:
+    from f.telegram_life_bot.retry_utils import get_retry_delay_seconds
+except ImportError:
+    # 로컬 테스트 등을 위한 fallback
+    from retry_utils import get_retry_delay_seconds
+
 genai.configure(api_key=wmill.get_variable("u/rapaellk/googleai_api_key_free"))
 
-def process_text_with_gemini(text_input, max_retries=3, delay_seconds=60):
-    # This system prompt contains all the logic you requested.
-    # The model will follow these rules.
-    SYSTEM_PROMPT = """
-    You are a text processing expert. Your task is to process the given text and return a JSON object.
+# This system prompt contains all the logic you requested.
+# The model will follow these rules.
+SYSTEM_PROMPT = """
+You are a text processing expert. Your task is to process the given text and return a JSON object.
 
-    Follow these steps precisely:
-    1.  First, clean the input text by removing all XML, HTML, and Markdown syntax (e.g., tags like <p>, <div>, and markers like **, #, [text](link)). Get the raw, plain text content.
-        1.1. Clean parts which are out of context (e.g., advertisement) as well
-    2.  Summarize the text with details in structured markdown form and put it in 'summarization' field. The summarization should be written with same language with the input text.
-        2.1. If necessary, you can use mermaid diagram syntax wrapped by ```mermaid\n...\n```. While doing so, use escape characters properly.
-        2.2. Headings which can be used in the summary is `#### Heading 4` or lower (`##### Heading 5`, ...).
-    3.  If the summarization is not written in Korean, translate it into Korean and put it into 'translated_in_korean'. If the summarization is already Korean, 'translated_in_korean' field can be omitted.
-    4.  Write a proper title for the summarization in Korean and put it in 'title' field.
-    5.  Based on the summary, decide 2~3 tags in Korean and put it in 'tags' field. Example: ["책", "유튜브", "개발"]
-    5.  Return *only* the final JSON object, with the exact schema: {"title": "...", "summarization": "...", "translated_in_korean": "...", "tags":["tag1", "tag2", ...]}.
-        Do not include any other text, explanations, or markdown delimiters (like ```json).
-    """
+Follow these steps precisely:
+1.  First, clean the input text by removing all XML, HTML, and Markdown syntax (e.g., tags like <p>, <div>, and markers like **, #, [text](link)). Get the raw, plain text content.
+    1.1. Clean parts which are out of context (e.g., advertisement) as well
+2.  Summarize the text with details in structured markdown form and put it in 'summarization' field. The summarization should be written with same language with the input text.
+    2.1. If necessary, you can use mermaid diagram syntax wrapped by ```mermaid\n...\n```. While doing so, use escape characters properly.
+    2.2. Headings which can be used in the summary is `#### Heading 4` or lower (`##### Heading 5`, ...).
+3.  If the summarization is not written in Korean, translate it into Korean and put it into 'translated_in_korean'. If the summarization is already Korean, 'translated_in_korean' field can be omitted.
+4.  Write a proper title for the summarization in Korean and put it in 'title' field.
+5.  Based on the summary, decide 2~3 tags in Korean and put it in 'tags' field. Example: ["책", "유튜브", "개발"]
+5.  Return *only* the final JSON object, with the exact schema: {"title": "...", "summarization": "...", "translated_in_korean": "...", "tags":["tag1", "tag2", ...]}.
+    Do not include any other text, explanations, or markdown delimiters (like ```json).
+"""
 
-    # Configure the model to use the system prompt and JSON output mode
-    model = genai.GenerativeModel(
-        'gemini-2.5-flash',
-        system_instruction=SYSTEM_PROMPT,
-        generation_config={
-            "response_mime_type": "application/json",
-            "temperature": 0.0  # <-- Add this line for maximum predictability
-        }
-    )
+# Configure the model to use the system prompt and JSON output mode.
+# Built once at import time and reused by every call.
+GEMINI_MODEL = genai.GenerativeModel(
+    'gemini-2.5-flash',
+    system_instruction=SYSTEM_PROMPT,
+    generation_config={
+        "response_mime_type": "application/json",
+        "temperature": 0.0  # <-- Add this line for maximum predictability
+    }
+)
+
+def process_text_with_gemini(text_input, max_retries=3, delay_seconds=60):
     current_try = 0
     while current_try <= max_retries:
         try:
             # Send the text to the model.
             # The model already knows the rules from the SYSTEM_PROMPT.
-            response = model.generate_content(text_input)
+            response = GEMINI_MODEL.generate_content(text_input)
             
             # The model, in JSON mode, should return a clean JSON string.
             # We parse it into a Python dictionary.
@@ -77,8 +85,9 @@ def process_text_with_gemini(text_input, max_retries=3, delay_seconds=60):
                 print(f"Last error: {e}")
                 raise
             
-            print(f"[Warning] Rate limit exceeded. Waiting for {delay_seconds} seconds... (Attempt {current_try}/{max_retries})")
-            time.sleep(delay_seconds)
+            wait_seconds = get_retry_delay_seconds(e, current_try, delay_seconds)
+            print(f"[Warning] Rate limit exceeded. Waiting for {wait_seconds:.1f} seconds... (Attempt {current_try}/{max_retries})")
+            time.sleep(wait_seconds)
         
         except json.JSONDecodeError as e:
             # The model returned invalid JSON
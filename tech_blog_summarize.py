@@ -1,13 +1,13 @@
 import wmill
-import feedparser
 from datetime import datetime, timedelta, timezone
 import calendar # For converting struct_time to UTC timestamp
 import ssl
 import traceback
 from typing import Set, Dict, Any, Optional, List, TypedDict
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-from u.rapaellk.news_parsing_utils import get_content_from_link, process_text_with_gemini, send_long_message_to_telegram, send_to_telegram
+from u.rapaellk.news_parsing_utils import MAX_WORKERS, parse_feed, get_content_from_link, process_text_with_gemini, send_long_message_to_telegram, send_to_telegram
 
 def get_item_id(item) -> Optional[str]:
     """
@@ -24,6 +24,23 @@ def get_item_id(item) -> Optional[str]:
         return item.title
     return None  # 고유 ID로 사용할 만한 키가 없음
 
+def summarize_entry(blog_name: str, entry) -> str:
+    """
+    RSS 항목 하나의 본문을 가져와 요약한 뒤 텔레그램 메시지 한 줄로 만듭니다.
+    """
+    if blog_name == "Netflix Tech Blog":
+        description = entry.content[0]['value']
+    elif blog_name in ("Google Research Blog", "Google DeepMind Blog"):
+        description = get_content_from_link(entry.link)
+    else:
+        description = entry.description
+    if description:
+        ai_processed_descriptions = process_text_with_gemini(description)
+        # 태그나 링크만 있어서 정리 후 남는 본문이 없으면 None이 반환됩니다.
+        if ai_processed_descriptions:
+            return f"* [{entry.title}]({entry.link})\n{ai_processed_descriptions['english']}\n{ai_processed_descriptions['korean']}\n\n"
+    return f"* [{entry.title}]({entry.link})\nCannot find its content...\n\n"
+
 def main():
     now_utc = datetime.now(timezone.utc)
     cutoff_time_utc = now_utc - timedelta(hours=24)
@@ -36,18 +53,20 @@ def main():
         "Slack Engineering Blog": "https://slack.engineering/feed/",
         "Netflix Tech Blog": "https://netflixtechblog.com/feed/"
     }
+    # Netflix Tech Blog 피드는 인증서 검증에 실패하므로, 그 피드에만 검증을 끈 컨텍스트를 사용합니다.
+    unverified_ssl_feeds = {"Netflix Tech Blog"}
+    unverified_ssl_context = ssl._create_unverified_context()
+    # 1. 블로그별로 cutoff 이내의 새 항목만 먼저 골라둡니다.
+    selected_entries: Dict[str, List[Any]] = {}
     for blog_name, feedurl in rss_feed_dict.items():
         try:
-            if blog_name == "Netflix Tech Blog":
-                if hasattr(ssl, '_create_unverified_context'):
-                    ssl._create_default_https_context = ssl._create_unverified_context
-            feed = feedparser.parse(feedurl)
-            message_title = f"**Recent updates on {blog_name}**\n"
-            message_to_send = ""
+            ssl_context = unverified_ssl_context if blog_name in unverified_ssl_feeds else None
+            feed = parse_feed(feedurl, ssl_context=ssl_context)
             if blog_name == "Google Developers Blog":
                 yesterday_list = json.loads(wmill.get_variable("u/rapaellk/google_developer_yesterday_rss"))
                 yesterday_set = set(yesterday_list)
                 today_set = set()
+            entries = []
             for index, entry in enumerate(feed.entries):
                 if hasattr(entry, 'published_parsed'):
                     pub_struct_time = entry.published_parsed
@@ -63,19 +82,25 @@ def main():
                 else:
                     if index > 2:
                         break
-                if blog_name == "Netflix Tech Blog":
-                    description = entry.content[0]['value']
-                elif blog_name == "Google Research Blog" or "Google DeepMind Blog":
-                    description = get_content_from_link(entry.link)
-                else:
-                    description = entry.description
-                if description:
-                    ai_processed_descriptions = process_text_with_gemini(description)
-                    if not ai_processed_descriptions:
-                        raise RuntimeError("Failed to retrieve ai summary")
-                    message_to_send += f"* [{entry.title}]({entry.link})\n{ai_processed_descriptions['english']}\n{ai_processed_descriptions['korean']}\n\n"
-                else:
-                    message_to_send += f"* [{entry.title}]({entry.link})\nCannot find its content...\n\n"
+                entries.append(entry)
+            selected_entries[blog_name] = entries
+        except Exception as e:
+            print(traceback.format_exc())
+            message = f"""Error on handling blog {blog_name}: `{e}`"""
+            send_to_telegram(message)
+
+    # 2. 모든 블로그의 항목을 한꺼번에 병렬로 요약합니다.
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            blog_name: [executor.submit(summarize_entry, blog_name, entry) for entry in entries]
+            for blog_name, entries in selected_entries.items()
+        }
+
+    # 3. 블로그별로 원래 순서대로 메시지를 조합하여 전송합니다.
+    for blog_name, blog_futures in futures.items():
+        try:
+            message_title = f"**Recent updates on {blog_name}**\n"
+            message_to_send = "".join(future.result() for future in blog_futures)
             if not message_to_send:
                 message_to_send += "no update today"
             print(message_to_send)
@@ -1,22 +1,21 @@
 # import wmill
-import feedparser
 import requests
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
-from u.rapaellk.news_parsing_utils import get_content_from_link, process_text_with_gemini, send_long_message_to_telegram, send_to_telegram, remove_html_tags_bs4
+from u.rapaellk.news_parsing_utils import MAX_WORKERS, parse_feed, SESSION, get_content_from_link, process_text_with_gemini, send_long_message_to_telegram, send_to_telegram, remove_html_tags_bs4
 
 def techmeme():
     try:
         message_title = "**Top News on Techmeme:**\n"
         rss_url = 'https://www.techmeme.com/feed.xml'
-        feed = feedparser.parse(rss_url)
+        feed = parse_feed(rss_url)
         message_to_send = ""
         for entry in feed.entries:
-            description = remove_html_tags_bs4(entry.description)
-            if description:
-                ai_processed_descriptions = process_text_with_gemini(remove_html_tags_bs4(description))
-                if not ai_processed_descriptions:
-                    raise RuntimeError("Failed to retrieve ai summary")
+            description = entry.description
+            # 태그나 링크만 있어서 정리 후 남는 본문이 없으면 None이 반환됩니다.
+            ai_processed_descriptions = process_text_with_gemini(description) if description else None
+            if ai_processed_descriptions:
                 message_to_send += f"* [{entry.title}]({entry.link})\n{ai_processed_descriptions['english']}\n{ai_processed_descriptions['korean']}\n\n"
             else:
                 message_to_send += f"* [{entry.title}]({entry.link})\nCannot find its content...\n\n"
@@ -30,6 +29,32 @@ def techmeme():
 HN_TOP_STORIES_URL = "https://hacker-news.firebaseio.com/v0/topstories.json"
 HN_ITEM_URL = "https://hacker-news.firebaseio.com/v0/item/{id}.json"
 
+def fetch_hacker_news_items(session: requests.Session, executor: ThreadPoolExecutor, item_ids) -> list:
+    """
+    Hacker News 스토리 상세 정보를 하나의 세션으로 한꺼번에 조회합니다.
+    세션을 공유하므로 firebaseio.com에 대한 TCP/TLS 연결이 재사용됩니다.
+    """
+    def fetch(item_id):
+        return session.get(HN_ITEM_URL.format(id=item_id)).json()
+    return list(executor.map(fetch, item_ids))
+
+def summarize_hacker_news_item(item_details) -> str:
+    """
+    Hacker News 스토리 하나를 요약하여 텔레그램 메시지 한 줄로 만듭니다.
+    URL이 없는 스토리(Ask HN 등)는 빈 문자열을 반환합니다.
+    """
+    if not item_details or 'url' not in item_details:
+        return ""
+    title = item_details.get('title')
+    link = item_details.get('url')
+    description = get_content_from_link(link)
+    if description:
+        ai_processed_descriptions = process_text_with_gemini(description)
+        # 태그나 링크만 있어서 정리 후 남는 본문이 없으면 None이 반환됩니다.
+        if ai_processed_descriptions:
+            return f"* [{title}]({link})\n{ai_processed_descriptions['english']}\n{ai_processed_descriptions['korean']}\n\n"
+    return f"* [{title}]({link})\nCannot find its content...\n\n"
+
 def hacker_news(limit=10):
     """
     Hacker News의 현재 Top 스토리를 가져옵니다.
@@ -37,21 +62,11 @@ def hacker_news(limit=10):
     print("Hacker News Top 스토리를 가져오는 중...")
     try:
         message_title = "**Top News on Hacker News:**\n"
-        message_to_send = ""
-        top_ids = requests.get(HN_TOP_STORIES_URL).json()
-        for item_id in top_ids[:limit]:
-            item_details = requests.get(HN_ITEM_URL.format(id=item_id)).json()
-            if item_details and 'url' in item_details:
-                title = item_details.get('title')
-                link = item_details.get('url')
-                description = get_content_from_link(link)
-                if description:
-                    ai_processed_descriptions = process_text_with_gemini(remove_html_tags_bs4(description))
-                    if not ai_processed_descriptions:
-                        raise RuntimeError("Failed to retrieve ai summary")
-                    message_to_send += f"* [{title}]({link})\n{ai_processed_descriptions['english']}\n{ai_processed_descriptions['korean']}\n\n"
-                else:
-                    message_to_send += f"* [{title}]({link})\nCannot find its content...\n\n"
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            top_ids = SESSION.get(HN_TOP_STORIES_URL).json()
+            items = fetch_hacker_news_items(SESSION, executor, top_ids[:limit])
+            # executor.map은 입력 순서대로 결과를 돌려주므로 랭킹 순서가 유지됩니다.
+            message_to_send = "".join(executor.map(summarize_hacker_news_item, items))
         print(message_to_send)       
         send_long_message_to_telegram(message_title + message_to_send)
     except Exception as e:
@@ -63,7 +78,7 @@ def geeknews():
     try:
         message_title = "**Top News on GeekNews:**\n"
         rss_url = 'https://feeds.feedburner.com/geeknews-feed'
-        feed = feedparser.parse(rss_url)
+        feed = parse_feed(rss_url)
         print(feed)
         message_to_send = ""
         for entry in feed.entries: